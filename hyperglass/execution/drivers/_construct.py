@@ -7,27 +7,77 @@ hyperglass API modules.
 
 # Standard Library
 import re
-import json as _json
+import sys
 from operator import attrgetter
+from functools import lru_cache
+
+# Third Party
+import orjson
 
 # Project
 from hyperglass.log import log
 from hyperglass.constants import TRANSPORT_REST, TARGET_FORMAT_SPACE
 from hyperglass.configuration import commands
 
+_TEMPLATE_FIELD = re.compile(r"\{(afi|source|target|vrf)\}")
+
+
+@lru_cache(maxsize=None)
+def _compile_command(command: str):
+    """Precompile a command template into a substitution callable.
+
+    str.format re-parses the template on every call. Rewriting the
+    documented fields to %-style placeholders once per unique template
+    leaves a single C-level interpolation per query. Templates
+    containing anything other than the documented fields are left to
+    str.format unchanged.
+    """
+    if "%" in command:
+        return command.format
+
+    rewritten = _TEMPLATE_FIELD.sub(r"%(\1)s", command)
+
+    if "{" in rewritten or "}" in rewritten:
+        return command.format
+
+    return lambda **fields: rewritten % fields
+
+
+@lru_cache(maxsize=None)
+def _device_commands(cmd_paths: tuple):
+    """Resolve a command template from its attribute path.
+
+    The set of (nos/command group, afi, query type) paths is small and
+    the commands object is immutable after config load, so each unique
+    path only pays the attrgetter walk once.
+    """
+    return attrgetter(".".join(cmd_paths))(commands)
+
 
 class Construct:
     """Construct SSH commands/REST API parameters from validated query data."""
 
+    __slots__ = (
+        "device",
+        "query_data",
+        "query_type",
+        "vrf_name",
+        "target",
+        "transport",
+        "afis",
+        "_rest_base",
+    )
+
     def __init__(self, device, query_data):
         """Initialize command construction."""
-        log.debug(
-            "Constructing {} query for '{}'",
-            query_data.query_type,
-            str(query_data.query_target),
-        )
+        vrf = query_data.query_vrf
+
         self.device = device
         self.query_data = query_data
+        # Each request parses a fresh query_type string; intern it so cache
+        # lookups keyed on it (e.g. resolved commands) compare by identity.
+        self.query_type = sys.intern(query_data.query_type)
+        self.vrf_name = vrf.name
         self.target = self.query_data.query_target
 
         # Set transport method based on NOS type
@@ -37,78 +87,70 @@ class Construct:
 
         # Remove slashes from target for required platforms
         if self.device.nos in TARGET_FORMAT_SPACE:
-            self.target = re.sub(r"\/", r" ", str(self.query_data.query_target))
-
-        # Set AFIs for based on query type
-        if self.query_data.query_type in ("bgp_route", "ping", "traceroute"):
-            # For IP queries, AFIs are enabled (not null/None) VRF -> AFI definitions
-            # where the IP version matches the IP version of the target.
-            self.afis = [
-                v
-                for v in (
-                    self.query_data.query_vrf.ipv4,
-                    self.query_data.query_vrf.ipv6,
-                )
-                if v is not None and self.query_data.query_target.version == v.version
-            ]
-        elif self.query_data.query_type in ("bgp_aspath", "bgp_community"):
-            # For AS Path/Community queries, AFIs are just enabled VRF -> AFI
-            # definitions, no IP version checking is performed (since there is no IP).
-            self.afis = [
-                v
-                for v in (
-                    self.query_data.query_vrf.ipv4,
-                    self.query_data.query_vrf.ipv6,
-                )
-                if v is not None
-            ]
-
-        with Formatter(self.device.nos, self.query_data.query_type) as formatter:
+            self.target = str(self.query_data.query_target).replace("/", " ")
+
+        # Set AFIs based on query type. For IP queries, AFIs are enabled
+        # (not null/None) VRF -> AFI definitions where the IP version matches
+        # the IP version of the target; the target is already a parsed IP
+        # object, so its version is read once up front. For AS Path/Community
+        # queries there is no IP, so all enabled AFI definitions match.
+        target_version = None
+        if self.query_type in ("bgp_route", "ping", "traceroute"):
+            target_version = self.query_data.query_target.version
+
+        self.afis = [
+            v
+            for v in (vrf.ipv4, vrf.ipv6)
+            if v is not None and target_version in (None, v.version)
+        ]
+
+        with Formatter(self.device.nos, self.query_type) as formatter:
             self.target = formatter(self.query_data.query_target)
 
-    def json(self, afi):
-        """Return JSON version of validated query for REST devices."""
-        log.debug("Building JSON query for {q}", q=repr(self.query_data))
-        return _json.dumps(
-            {
-                "query_type": self.query_data.query_type,
-                "vrf": self.query_data.query_vrf.name,
-                "afi": afi.protocol,
-                "source": str(afi.source_address),
+        # Base REST payload; json() fills in the per-AFI fields.
+        self._rest_base = None
+        if self.transport == "rest":
+            self._rest_base = {
+                "query_type": self.query_type,
+                "vrf": self.vrf_name,
+                "afi": None,
+                "source": None,
                 "target": str(self.target),
             }
-        )
+
+    def json(self, afi):
+        """Return JSON version of validated query for REST devices."""
+        payload = self._rest_base
+        payload["afi"] = afi.protocol
+        payload["source"] = str(afi.source_address)
+        return orjson.dumps(payload).decode()
 
     def scrape(self, afi):
         """Return formatted command for 'Scrape' endpoints (SSH)."""
         if self.device.structured_output:
-            cmd_paths = (
-                self.device.nos,
-                "structured",
-                afi.protocol,
-                self.query_data.query_type,
-            )
+            cmd_paths = (self.device.nos, "structured", afi.protocol, self.query_type)
         else:
-            cmd_paths = (self.device.commands, afi.protocol, self.query_data.query_type)
+            cmd_paths = (self.device.commands, afi.protocol, self.query_type)
 
-        command = attrgetter(".".join(cmd_paths))(commands)
-        return command.format(
+        command = _device_commands(cmd_paths)
+        return _compile_command(command)(
             target=self.target,
             source=str(afi.source_address),
-            vrf=self.query_data.query_vrf.name,
+            vrf=self.vrf_name,
         )
 
     def queries(self):
         """Return queries for each enabled AFI."""
-        query = []
+        builder = self.json if self.transport == "rest" else self.scrape
+        query = tuple(builder(afi=afi) for afi in self.afis)
 
-        for afi in self.afis:
-            if self.transport == "rest":
-                query.append(self.json(afi=afi))
-            else:
-                query.append(self.scrape(afi=afi))
-
-        log.debug("Constructed query: {}", query)
+        log.debug(
+            "Constructed {} query for '{}' via {}: {}",
+            self.query_type,
+            self.target,
+            self.transport,
+            query,
+        )
         return query
 
 
@@ -90,7 +90,7 @@ def validate_ip(value, query_type, query_vrf):  # noqa: C901
 
     ip_version = valid_ip.version
 
-    vrf_afi = getattr(query_vrf, f"ipv{ip_version}")
+    vrf_afi = query_vrf[ip_version]
 
     if vrf_afi is None:
         raise InputInvalid(
@@ -28,6 +28,8 @@ from ..main import HyperglassModel, HyperglassModelExtra
 ACLAction = constr(regex=r"permit|deny")
 AddressFamily = Union[Literal[4], Literal[6]]
 
+_AFI_ATTR = {4: "ipv4", 6: "ipv6"}
+
 
 def find_vrf_id(values: Dict) -> str:
     """Generate (private) VRF ID."""
@@ -266,10 +268,11 @@ add 'default: true' to the VRF definition.
 
     def __getitem__(self, i: AddressFamily) -> Union[DeviceVrf4, DeviceVrf6]:
         """Access the VRF's AFI by IP protocol number."""
-        if i not in (4, 6):
+        attr = _AFI_ATTR.get(i)
+        if attr is None:
             raise AttributeError(f"Must be 4 or 6, got '{i}'")
 
-        return getattr(self, f"ipv{i}")
+        return getattr(self, attr)
 
     def __hash__(self) -> int:
         """Make VRF object hashable so the object can be deduplicated with set()."""